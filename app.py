@@ -8,6 +8,10 @@
 # 6) 세션 보안 쿠키/템플릿 재로딩 옵션 보강
 # 7) 미디어 라우트 분리: 이력서(resume) + 사진(photo) 보호 디렉터리 제공
 # 8) (신설) 변경 로그(change_log.jsonl) 기록/조회: 최근 변경 사항 카드에 표시, 최종 수정자/시각 산출
+# 9) 런타임 저장소 SQLite(insa.db): 엑셀은 가져오기 원본 + 내보내기/종료 시 일괄 기록
+# 10) 프로세스 내 DataFrame 캐시: 요청마다 재로딩하지 않음(수정 시 캐시 갱신)
+#     - 읽기-쓰기 잠금(RWLock): 캐시 조회는 동시 진행, 재구성/수정/내보내기만 단독
+# 11) 날짜/급여/내선번호 정규화를 캐시 구성 시 1회 일괄 수행(normalize_df, 표시용), 상세 GET에서는 생략
 # ─────────────────────────────────────────────────────────────────────
 
 # ============================
@@ -16,19 +20,42 @@
 import os
 import re
 import json
-from datetime import datetime, timedelta
-from threading import Lock
+import time
+import atexit
+import sqlite3
+import tempfile
+import ipaddress
+from collections import deque
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from datetime import date, datetime, time as dtime, timedelta
+from threading import Lock, Condition
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Set, Dict, List
-import json
+from typing import Set, FrozenSet, Dict, List, Optional, Tuple, Deque
 
 # ============================
 # [3RD PARTY]
 # ============================
 import pandas as pd
+import openpyxl
+try:
+    import orjson  # (선택) 변경 로그 JSON 인코딩/파싱 가속
+except ImportError:
+    orjson = None
+try:
+    import xlsxwriter  # (선택) 전체 엑셀 내보내기 가속(없으면 openpyxl write_only)
+except ImportError:
+    xlsxwriter = None
+try:
+    import python_calamine  # (선택) 엑셀 가져오기 가속(Rust 파서, 없으면 openpyxl read_only)
+except ImportError:
+    python_calamine = None
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, flash, abort, send_file
+    url_for, flash, abort, send_from_directory
 )
 from flask_login import (
     LoginManager, UserMixin,
@@ -38,6 +65,49 @@ from flask_login import (
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.exceptions import NotFound
 
+# ============================
+# [CONCURRENCY] Readers-writer lock
+# ============================
+class RWLock:
+    """
+    읽기는 동시에 여럿, 쓰기는 단독으로 허용하는 잠금(재진입 불가).
+    - 쓰기 대기 중이면 새 읽기는 대기(쓰기 기아 방지)
+    """
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 # ============================
 # [CONFIG] Paths & Globals
 # ============================
@@ -47,10 +117,33 @@ DB_DIR: Path = APP_ROOT / "private" / "db"
 DB_DIR.mkdir(parents=True, exist_ok=True)                     # 폴더 없으면 생성
 DB_FILENAME: str = os.getenv("DB_FILENAME", "insa_DB.xlsx")
 EXCEL_PATH: Path = DB_DIR / DB_FILENAME
-EXCEL_LOCK = Lock()
+
+# 런타임 저장소(SQLite). 엑셀은 가져오기 원본/내보내기 대상으로만 사용
+# - 최초 기동 또는 엑셀이 외부에서 바뀌면 엑셀 → SQLite 가져오기
+# - 수정은 SQLite 행 단위 UPDATE, 엑셀은 내보내기/종료 시 일괄 기록
+SQLITE_PATH: Path = DB_DIR / "insa.db"
+SQLITE_WAL_PATH: Path = DB_DIR / "insa.db-wal"
+# 읽기(캐시 조회)는 동시 진행, 가져오기/캐시 재구성/수정/내보내기만 쓰기 잠금
+DB_LOCK = RWLock()
+_DB_CONN: Optional[sqlite3.Connection] = None
+
+# 프로세스 내 DataFrame 캐시(DB_LOCK 보호). 가져오기/타 프로세스 수정 시 무효화
+# - _FRESH_KEYS: 캐시 검증 시점의 (엑셀, WAL) 파일 키. 그대로면 읽기 잠금만으로 캐시 반환
+_FRESH_KEYS: Optional[Tuple[str, str]] = None
+_DF_CACHE: Optional[pd.DataFrame] = None
+_DF_DATA_VERSION: int = -1        # 캐시 시점의 PRAGMA data_version
+_NAME_INDEX: Dict[str, int] = {}  # 이름 → 행 위치(동명이인은 첫 행)
+_COL_INDEX: Dict[str, int] = {}   # 컬럼명 → 열 위치
+# 직원 목록 검색용 소문자 결합 문자열(캐시 DataFrame별 1회 계산). (원본 df, 결과) 쌍
+_SEARCH_TEXT: Tuple[Optional[pd.DataFrame], Optional[pd.Series]] = (None, None)
+SEARCH_COLUMNS: List[str] = ["name", "team_name", "position", "extension_number", "mbti"]
+# 부분 갱신용 openpyxl 통합문서(DB_LOCK 쓰기 잠금 보호). key: 마지막 저장 시점의 _xlsx_key()
+_WB_CACHE: Dict[str, object] = {"key": None, "wb": None}
 
 # 변경 로그(최근 변경 사항 카드/최종 수정자 표시용)
 LOG_PATH: Path = DB_DIR / "change_log.jsonl"
+_LOG_FD: Optional[int] = None  # O_APPEND 파일 디스크립터(최초 기록 시 오픈)
+_LOG_FD_LOCK = Lock()
 
 # 상세 화면(UI)에서 사용하는 모든 컬럼(누락 시 자동 추가)
 ALL_EMP_FIELDS: List[str] = [
@@ -65,6 +158,9 @@ ALL_EMP_FIELDS: List[str] = [
     "ceo_meeting_notes", "notes",
 ]
 
+# SQLite 컬럼명은 대소문자 구분 없음 → 엑셀 헤더 "MBTI"/"Name" 등은 UI 컬럼명으로 맞춤(_xlsx_header)
+_FIELD_BY_LOWER: Dict[str, str] = {f.lower(): f for f in ALL_EMP_FIELDS}
+
 # 최초 생성 시 최소 기본 컬럼
 EMP_BASE_COLS = [
     "name", "team_name", "position", "extension_number", "phone_number",
@@ -77,11 +173,10 @@ RESUME_DIR.mkdir(parents=True, exist_ok=True)
 PHOTO_DIR: Path = APP_ROOT / "private" / "photo"
 PHOTO_DIR.mkdir(parents=True, exist_ok=True)
 
-# IP 화이트리스트(비어있으면 기능 비활성)
-IP_WHITELIST: Set[str] = set()
-_raw_ips = os.getenv("IP_WHITELIST", "").strip()
-if _raw_ips:
-    IP_WHITELIST |= {ip.strip() for ip in _raw_ips.split(",") if ip.strip()}
+# IP 화이트리스트(비어있으면 기능 비활성). 쉼표 구분, 단일 IP 또는 CIDR(예: 10.0.0.0/24)
+IP_WHITELIST: FrozenSet[str] = frozenset(
+    ip.strip() for ip in os.getenv("IP_WHITELIST", "").split(",") if ip.strip()
+)
 
 # ============================
 # [APP INIT]
@@ -94,17 +189,110 @@ app.config.update(
     SESSION_COOKIE_SAMESITE="Lax",
     SESSION_COOKIE_SECURE=(os.getenv("SESSION_COOKIE_SECURE", "0") == "1"),
     TEMPLATES_AUTO_RELOAD=(os.getenv("FLASK_DEBUG", "0") == "1"),
+    # 미디어 전송을 앞단 웹서버(X-Sendfile 지원)에 위임. 프록시 뒤에서만 켤 것
+    USE_X_SENDFILE=(os.getenv("USE_X_SENDFILE", "0") == "1"),
 )
 
 # ============================
-# [DATA ACCESS] Excel helpers
+# [DATA ACCESS] SQLite store + Excel import/export
 # ============================
+def _write_xlsx(df: pd.DataFrame, path: Path) -> None:
+    """
+    DataFrame → XLSX(값만) 스트리밍 저장.
+    - xlsxwriter 설치 시 constant_memory 모드로 기록(openpyxl보다 수 배 빠름)
+      · 값은 전부 문자열로 기록(write_string: 수식/URL/숫자 자동 변환 없음), 빈 값은 빈 셀
+    - 없으면 openpyxl write_only 모드: 셀 스타일 계산 없이 행 단위로 기록(메모리 일정)
+    """
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+        try:
+            ws = wb.add_worksheet("Sheet1")
+            ws.write_row(0, 0, [str(c) for c in df.columns])  # constant_memory: 행 순서대로 기록
+            for r, rec in enumerate(df.itertuples(index=False, name=None), start=1):
+                for c, v in enumerate(rec):
+                    if v != "":
+                        ws.write_string(r, c, v)
+        finally:
+            wb.close()
+        return
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(list(df.columns))
+    for rec in df.itertuples(index=False, name=None):
+        ws.append(rec)
+    wb.save(path)
+
+def _xlsx_cell_str(v: object) -> str:
+    """엑셀 셀 값 → 문자열(pandas read_excel(dtype=str)과 같은 표기: 정수형 float는 꼬리 .0 없음)."""
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    if isinstance(v, date) and not isinstance(v, datetime):  # calamine: 시각 없는 날짜
+        return str(datetime.combine(v, dtime()))
+    return str(v)
+
+def _xlsx_header(values) -> List[str]:
+    """
+    헤더 행 값 → 컬럼명 목록(가져오기/부분 갱신 공용, 둘이 같은 열을 가리키도록).
+    - 빈 헤더는 "Unnamed: N", 중복 헤더는 첫 번째가 원래 이름, 이후 ".1", ".2" 접미사(pandas와 동일)
+    - 접미사는 원래 헤더/이미 만든 이름과 겹치지 않을 때까지 증가(예: 비고, 비고, 비고.1 → 비고, 비고.2, 비고.1)
+    - 빈 헤더보다 실제 헤더가 원래 이름을 먼저 차지(실제 "Unnamed: 0" 헤더가 있으면 빈 헤더 쪽에 접미사)
+    - SQLite용으로 중복 판정은 대소문자 무시: UI 컬럼과 대소문자만 다른 헤더는 UI 컬럼명으로 바꾸고
+      ("MBTI" → "mbti"), 그 밖에 대소문자만 다른 헤더끼리는 뒤쪽에 접미사("Note", "note" → "Note", "note.1")
+    """
+    raw = [_xlsx_cell_str(v) for v in values]
+    header = [_FIELD_BY_LOWER.get(col.lower(), col) or f"Unnamed: {i}" for i, col in enumerate(raw)]
+    used: Set[str] = {col.lower() for col in header}
+    counts: Dict[str, int] = {}
+    taken: Set[str] = set()
+    for i in sorted(range(len(header)), key=lambda i: not raw[i]):
+        col = header[i]
+        if col.lower() in taken:
+            n = counts.get(col.lower(), 0) + 1
+            while f"{col}.{n}".lower() in used:
+                n += 1
+            counts[col.lower()] = n
+            col = header[i] = f"{col}.{n}"
+            used.add(col.lower())
+        taken.add(col.lower())
+    return header
+
+def _rows_to_df(rows) -> pd.DataFrame:
+    """
+    시트 행(값 튜플/리스트) 반복자 → 문자열형 DataFrame. 첫 행이 헤더(_xlsx_header).
+    - 완전히 빈 행은 제외
+    """
+    rows = iter(rows)
+    header = _xlsx_header(next(rows, ()))
+    width = len(header)
+    records = []
+    for row in rows:
+        rec = [_xlsx_cell_str(v) for v in row[:width]]
+        if any(rec):
+            records.append(rec + [""] * (width - len(rec)))
+    return pd.DataFrame(records, columns=header, dtype=object)
+
+def _read_xlsx(path: Path) -> pd.DataFrame:
+    """
+    첫 시트를 문자열형 DataFrame으로 읽기(값만).
+    - python-calamine 설치 시 Rust 파서로 읽음(openpyxl 대비 수 배 빠르고 메모리 적음)
+      · skip_empty_area=False: 시트 앞쪽 빈 행/열도 유지(openpyxl과 같은 A1 기준)
+    - 없으면 openpyxl read_only 스트리밍(시트 DOM 미생성), 통합문서는 즉시 닫음
+    """
+    if python_calamine is not None:
+        sheet = python_calamine.CalamineWorkbook.from_path(str(path)).get_sheet_by_index(0)
+        return _rows_to_df(sheet.to_python(skip_empty_area=False))
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        return _rows_to_df(wb.worksheets[0].iter_rows(values_only=True))
+    finally:
+        wb.close()
+
 def _ensure_excel_exists() -> None:
-    """엑셀 파일이 없으면 최소 기본 컬럼으로 생성."""
+    """엑셀 파일이 없으면 최소 기본 컬럼으로 생성. DB_LOCK 쓰기 잠금 내부에서 호출."""
     if not EXCEL_PATH.exists():
-        with EXCEL_LOCK:
-            df = pd.DataFrame(columns=EMP_BASE_COLS)
-            df.to_excel(EXCEL_PATH, index=False, engine="openpyxl")
+        _write_xlsx(pd.DataFrame(columns=EMP_BASE_COLS), EXCEL_PATH)
 
 def _ensure_all_columns(df: pd.DataFrame) -> pd.DataFrame:
     """UI가 요구하는 컬럼이 엑셀에 없으면 빈 문자열로 추가."""
@@ -113,68 +301,429 @@ def _ensure_all_columns(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = ""
     return df
 
-def load_df() -> pd.DataFrame:
-    """엑셀을 로드하여 문자열형으로 전달. 결측치는 빈 문자열."""
+def _qi(col: str) -> str:
+    """SQL 식별자 인용(컬럼명에 공백/괄호 포함 가능)."""
+    return '"' + col.replace('"', '""') + '"'
+
+def _file_key(path: Path) -> str:
+    """파일 변경 감지 키(mtime + 크기, stat 1회). 파일이 없으면 빈 문자열."""
+    try:
+        st = path.stat()
+    except OSError:
+        return ""
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def _xlsx_key() -> str:
+    """엑셀 변경 감지 키."""
+    return _file_key(EXCEL_PATH)
+
+def _fresh_keys() -> Tuple[str, str]:
+    """(엑셀, SQLite WAL) 키: 외부 엑셀 수정/타 프로세스 커밋이 있으면 달라짐."""
+    return _xlsx_key(), _file_key(SQLITE_WAL_PATH)
+
+def _meta_get(conn: sqlite3.Connection, key: str) -> str:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else ""
+
+def _meta_set(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+def _db_locked() -> sqlite3.Connection:
+    """SQLite 연결(프로세스당 1개, 최초 호출 시 오픈). DB_LOCK 쓰기 잠금 내부에서 호출."""
+    global _DB_CONN
+    if _DB_CONN is None:
+        conn = sqlite3.connect(str(SQLITE_PATH), isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # 엑셀로 아직 내보내지 않은 셀(직원명, 컬럼) 목록
+        conn.execute("CREATE TABLE IF NOT EXISTS dirty_cells (name TEXT, col TEXT, PRIMARY KEY (name, col))")
+        _DB_CONN = conn
+    return _DB_CONN
+
+def _import_xlsx_locked(conn: sqlite3.Connection) -> None:
+    """
+    엑셀 → SQLite 가져오기(employees 테이블 교체). DB_LOCK 쓰기 잠금 내부에서 호출.
+    - 모든 컬럼은 TEXT. 동명이인이 있을 수 있어 name은 PK가 아닌 인덱스
+    - 엑셀로 내보내지 않은 수정사항(dirty_cells)은 새로 읽은 행 위에 다시 덮어씀(유실 방지)
+      · 그대로 dirty로 남겨 다음 flush_xlsx에서 엑셀에 기록
+      · 직원이 엑셀에서 사라졌으면 덮어쓸 곳이 없으므로 오류 로그로 남김
+    """
+    global _DF_CACHE
     _ensure_excel_exists()
-    with EXCEL_LOCK:
-        df = pd.read_excel(EXCEL_PATH, engine="openpyxl", dtype=str).fillna("")
-    return _ensure_all_columns(df)
+    key = _xlsx_key()
+    df = _ensure_all_columns(_read_xlsx(EXCEL_PATH))  # 원본 값 그대로 저장(정규화는 캐시에서만)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        pending = _pending_cells_locked(conn)
+        kept = _merge_pending(df, pending)
+        # 컬럼 목록은 병합 뒤에 산출(엑셀에서 빠진 컬럼을 병합이 되살릴 수 있음)
+        cols = ", ".join(_qi(c) for c in df.columns)
+        marks = ", ".join("?" for _ in df.columns)
+        conn.execute("DROP TABLE IF EXISTS employees")
+        conn.execute(f"CREATE TABLE employees ({', '.join(_qi(c) + ' TEXT' for c in df.columns)})")
+        conn.executemany(f"INSERT INTO employees ({cols}) VALUES ({marks})",
+                         df.itertuples(index=False, name=None))
+        conn.execute("CREATE INDEX idx_employees_name ON employees (name)")
+        conn.execute("DELETE FROM dirty_cells")
+        conn.executemany("INSERT INTO dirty_cells (name, col) VALUES (?, ?)", kept)
+        _meta_set(conn, "xlsx_key", key)
+        _meta_set(conn, "dirty", "1" if kept else "0")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    if pending:
+        lost = sorted({n for n, _, _ in pending} - {n for n, _ in kept})
+        app.logger.warning(f"엑셀이 외부에서 변경되어 다시 가져옴: 엑셀로 내보내지 않은 수정사항 {len(kept)}건 유지")
+        if lost:
+            app.logger.error(f"엑셀에서 사라진 직원의 미반영 수정사항은 적용하지 못함: {', '.join(lost)}")
+    _DF_CACHE = None
+
+def _pending_cells_locked(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
+    """엑셀로 내보내지 않은 셀의 (직원명, 컬럼, 현재 값). 트랜잭션 내부에서 호출."""
+    if _meta_get(conn, "dirty") != "1":
+        return []
+    pending = []
+    for name, col in conn.execute("SELECT name, col FROM dirty_cells").fetchall():
+        row = conn.execute(
+            f"SELECT {_qi(col)} FROM employees "
+            "WHERE rowid = (SELECT MIN(rowid) FROM employees WHERE name = ?)",
+            (name,),
+        ).fetchone()
+        if row is not None:
+            pending.append((name, col, row[0] if row[0] is not None else ""))
+    return pending
+
+def _merge_pending(df: pd.DataFrame, pending: List[Tuple[str, str, str]]) -> List[Tuple[str, str]]:
+    """미반영 수정 값을 df(동명이인은 첫 행)에 덮어쓰고, 적용된 (직원명, 컬럼) 목록 반환."""
+    if not pending:
+        return []
+    rows: Dict[str, int] = {}
+    for i, n in enumerate(df["name"]):
+        rows.setdefault(n, i)
+    by_lower = {c.lower(): c for c in df.columns}
+    kept = []
+    for name, col, value in pending:
+        if name not in rows:
+            continue
+        col = by_lower.get(col.lower(), col)  # 헤더 대소문자만 바뀐 경우 같은 컬럼(SQLite 기준)
+        if col not in df.columns:  # 엑셀에서 컬럼이 빠진 경우: 빈 컬럼으로 되살림
+            df[col] = ""
+            by_lower[col.lower()] = col
+        df.iat[rows[name], df.columns.get_loc(col)] = value
+        kept.append((name, col))
+    return kept
+
+def _sync_locked() -> sqlite3.Connection:
+    """
+    SQLite 연결 + 최신 상태 보장. DB_LOCK 쓰기 잠금 내부에서 호출.
+    - 테이블이 없거나 엑셀이 마지막 가져오기/내보내기 이후 바뀌었으면 다시 가져옴
+    - 다른 프로세스가 수정했으면(data_version 변경) 메모리 캐시 무효화
+    """
+    global _DF_CACHE
+    conn = _db_locked()
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees'"
+    ).fetchone()
+    key = _xlsx_key()
+    if not has_table or (key and key != _meta_get(conn, "xlsx_key")):
+        _import_xlsx_locked(conn)
+    if conn.execute("PRAGMA data_version").fetchone()[0] != _DF_DATA_VERSION:
+        _DF_CACHE = None
+    return conn
+
+def _set_cache_locked(df: pd.DataFrame, data_version: int) -> None:
+    """메모리 캐시 + 이름/컬럼 위치 인덱스 교체. DB_LOCK 쓰기 잠금 내부에서 호출."""
+    global _DF_CACHE, _DF_DATA_VERSION, _NAME_INDEX, _COL_INDEX
+    name_index: Dict[str, int] = {}
+    for i, n in enumerate(df["name"].astype(str)):
+        name_index.setdefault(n, i)
+    _DF_CACHE = df
+    _DF_DATA_VERSION = data_version
+    _NAME_INDEX = name_index
+    _COL_INDEX = {c: i for i, c in enumerate(df.columns)}
+
+def _read_employees(conn: sqlite3.Connection) -> pd.DataFrame:
+    """SQLite employees 테이블(저장된 원본 값, 결측은 빈 문자열)."""
+    return pd.read_sql_query("SELECT * FROM employees ORDER BY rowid", conn).fillna("")
+
+def _cached_df_locked(conn: sqlite3.Connection) -> pd.DataFrame:
+    """
+    메모리 캐시가 비었으면 SQLite에서 다시 읽어 채움. DB_LOCK 쓰기 잠금 내부에서 호출.
+    - 캐시(표시용)만 날짜/급여/내선번호 정규화(normalize_df). SQLite/엑셀에는 원본 값 유지
+    """
+    if _DF_CACHE is None:
+        df = normalize_df(_read_employees(conn))
+        _set_cache_locked(df, conn.execute("PRAGMA data_version").fetchone()[0])
+    return _DF_CACHE
 
-def save_df(df: pd.DataFrame) -> None:
+def load_df_indexed(copy: bool = True) -> Tuple[pd.DataFrame, Dict[str, int], Dict[str, int]]:
     """
-    엑셀 저장(락 포함).
-    - 안정성: 임시파일로 먼저 저장 후 원본 교체(atomic write).
+    load_df + 같은 캐시 버전의 (이름→행 위치, 컬럼→열 위치) 인덱스.
+    - 인덱스는 읽기 전용으로 사용할 것
     """
-    with EXCEL_LOCK:
-        tmp_path = EXCEL_PATH.with_suffix(".tmp.xlsx")
-        df.to_excel(tmp_path, index=False, engine="openpyxl")
-        os.replace(tmp_path, EXCEL_PATH)
+    global _FRESH_KEYS
+    keys = _fresh_keys()
+    with DB_LOCK.read():
+        if _DF_CACHE is not None and keys == _FRESH_KEYS:
+            df, name_index, col_index = _DF_CACHE, _NAME_INDEX, _COL_INDEX
+            return (df.copy() if copy else df), name_index, col_index
+    with DB_LOCK.write():
+        _cached_df_locked(_sync_locked())
+        _FRESH_KEYS = keys  # 검증 전에 잰 키: 그 사이 변경이 있었다면 다음 호출에서 재검증
+        df, name_index, col_index = _DF_CACHE, _NAME_INDEX, _COL_INDEX
+    return (df.copy() if copy else df), name_index, col_index
+
+def load_df(copy: bool = True) -> pd.DataFrame:
+    """
+    직원 DB를 문자열형 DataFrame으로 전달. 결측치는 빈 문자열.
+    - SQLite에서 읽은 결과를 메모리에 캐시(수정/가져오기 시에만 재구성)
+    - copy=False: 읽기 전용 호출부용(캐시 원본 반환, 수정 금지)
+    """
+    return load_df_indexed(copy)[0]
+
+def search_text(df: pd.DataFrame) -> pd.Series:
+    """
+    검색 대상 컬럼(SEARCH_COLUMNS)을 행별로 소문자 결합한 Series(df와 같은 인덱스).
+    - 캐시 원본(load_df(copy=False))과 짝지어 보관: 캐시가 교체될 때만 다시 계산
+    - 구분자 NUL: 컬럼 경계를 넘는 부분일치 방지
+    """
+    global _SEARCH_TEXT
+    cached_df, text = _SEARCH_TEXT
+    if cached_df is df and text is not None:
+        return text
+    text = df[SEARCH_COLUMNS[0]].astype(str).str.lower()
+    for col in SEARCH_COLUMNS[1:]:
+        text = text + "\0" + df[col].astype(str).str.lower()
+    _SEARCH_TEXT = (df, text)
+    return text
+
+def update_employee(name: str, changes: Dict[str, str]) -> bool:
+    """
+    직원 1명의 변경 필드만 저장(행 단위 UPDATE, 동명이인은 첫 행). 저장 여부 반환.
+    - 엑셀은 즉시 다시 쓰지 않음(dirty 표시 → flush_xlsx에서 일괄 기록)
+    - 메모리 캐시는 복사본에 반영 후 교체(읽는 쪽이 들고 있는 캐시는 불변)
+    - 그사이 다시 가져온 엑셀에 직원이 없으면(UPDATE 0행) 롤백 후 False
+    """
+    if not changes:
+        return True
+    with DB_LOCK.write():
+        conn = _sync_locked()
+        sets = ", ".join(f"{_qi(col)} = ?" for col in changes)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(
+                f"UPDATE employees SET {sets} "
+                "WHERE rowid = (SELECT MIN(rowid) FROM employees WHERE name = ?)",
+                (*changes.values(), name),
+            )
+            if cur.rowcount == 0:
+                conn.execute("ROLLBACK")
+                return False
+            conn.executemany("INSERT OR IGNORE INTO dirty_cells (name, col) VALUES (?, ?)",
+                             [(name, col) for col in changes])
+            _meta_set(conn, "dirty", "1")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if _DF_CACHE is not None and name in _NAME_INDEX:
+            df = _DF_CACHE.copy()
+            idx = _NAME_INDEX[name]
+            for col, value in changes.items():
+                df.iat[idx, _COL_INDEX[col]] = value
+            _set_cache_locked(df, _DF_DATA_VERSION)
+    return True
+
+def _take_workbook_locked() -> openpyxl.Workbook:
+    """
+    부분 갱신할 통합문서. 엑셀이 마지막 저장 이후 그대로면 메모리의 것을 재사용(압축 해제/XML 파싱 생략).
+    - 꺼내면서 캐시를 비움: 갱신/저장이 성공해 원본 교체까지 끝난 뒤에만 다시 넣음(flush_xlsx)
+    - DB_LOCK 쓰기 잠금 내부에서 호출
+    """
+    wb, key = _WB_CACHE["wb"], _WB_CACHE["key"]
+    _WB_CACHE.update(key=None, wb=None)
+    if wb is not None and key == _xlsx_key():
+        return wb
+    return openpyxl.load_workbook(EXCEL_PATH)
+
+def _patch_xlsx(wb: openpyxl.Workbook, df: pd.DataFrame, cells: List[Tuple[str, str]],
+                name_index: Dict[str, int], col_index: Dict[str, int], path: Path) -> bool:
+    """
+    통합문서에서 변경된 셀만 갱신해 path로 저장(서식/다른 시트 유지).
+    - 대상 컬럼/직원 행을 엑셀에서 찾지 못하면 False(셀 수정 전 판별, 전체 다시 쓰기로 대체)
+    """
+    ws = wb.worksheets[0]
+    row1 = ws[1]
+    header = {col: c.column for col, c in zip(_xlsx_header(c.value for c in row1), row1)}
+    if "name" not in header or any(col not in header for _, col in cells):
+        return False
+    want = {n for n, _ in cells}
+    rows: Dict[str, int] = {}
+    for (cell,) in ws.iter_rows(min_row=2, min_col=header["name"], max_col=header["name"]):
+        n = _xlsx_cell_str(cell.value)
+        if n in want and n not in rows:
+            rows[n] = cell.row
+    if len(rows) != len(want):
+        return False
+    for n, col in cells:
+        v = df.iat[name_index[n], col_index[col]]
+        ws.cell(row=rows[n], column=header[col]).value = v if v != "" else None
+    wb.save(path)
+    return True
+
+def flush_xlsx() -> bool:
+    """
+    엑셀로 내보내지 않은 수정사항이 있으면 SQLite → 엑셀 기록. 기록 여부 반환.
+    - 변경된 셀만 갱신(openpyxl, 통합문서는 메모리에 유지해 다음 기록 때 재사용),
+      불가하면(엑셀에 없는 컬럼 등) 전체 다시 쓰기
+    - 안정성: 임시파일로 먼저 저장 후 원본 교체(atomic write)
+    - 기록 값은 SQLite 원본(표시용 정규화 캐시 아님): 전체 다시 쓰기에도 수정하지 않은 값은 그대로
+    """
+    with DB_LOCK.write():
+        conn = _sync_locked()
+        # 다른 프로세스(워커별 atexit 등)와 겹치지 않도록 확인~기록~meta 갱신을 쓰기 트랜잭션으로 직렬화
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _meta_get(conn, "dirty") != "1":
+                conn.execute("ROLLBACK")
+                return False
+            df = _read_employees(conn)  # 쓰기 트랜잭션 안에서 읽어 다른 프로세스 수정까지 반영
+            name_index: Dict[str, int] = {}
+            for i, n in enumerate(df["name"]):
+                name_index.setdefault(n, i)
+            col_index = {c: i for i, c in enumerate(df.columns)}
+            cells = [tuple(r) for r in conn.execute("SELECT name, col FROM dirty_cells")]
+            fd, tmp_name = tempfile.mkstemp(dir=str(DB_DIR), suffix=".xlsx")  # 프로세스별 임시파일
+            os.close(fd)
+            tmp_path = Path(tmp_name)
+            try:
+                wb = None
+                if cells and all(n in name_index for n, _ in cells):
+                    wb = _take_workbook_locked()
+                    if not _patch_xlsx(wb, df, cells, name_index, col_index, tmp_path):
+                        wb = None
+                if wb is None:
+                    _write_xlsx(df, tmp_path)
+                os.replace(tmp_path, EXCEL_PATH)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            if wb is not None:
+                _WB_CACHE.update(key=_xlsx_key(), wb=wb)
+            conn.execute("DELETE FROM dirty_cells")
+            _meta_set(conn, "xlsx_key", _xlsx_key())
+            _meta_set(conn, "dirty", "0")
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    return True
+
+@atexit.register
+def _flush_xlsx_on_exit() -> None:
+    """프로세스 종료 시 미반영 수정사항을 엑셀에 기록."""
+    if _DB_CONN is None:
+        return
+    try:
+        flush_xlsx()
+    except Exception:
+        app.logger.exception("종료 시 엑셀 기록 실패(수정사항은 SQLite에 보존됨)")
 
 # ============================
 # [CHANGE LOG] 기록/조회 유틸
 # ============================
 def _diff_row(old: Dict[str, str], new: Dict[str, str]) -> List[Dict[str, str]]:
-    """행 단위 변경점 계산(name 제외)."""
+    """
+    행 단위 변경점 계산(name 제외).
+    - old/new는 같은 행의 스냅샷(키 동일) 기준: old 키만 순회
+    - 값이 같으면 strip 없이 건너뜀(대부분의 컬럼)
+    """
     diffs: List[Dict[str, str]] = []
-    keys = set(old.keys()) | set(new.keys())
-    for k in keys:
+    for k, ov in old.items():
         if k == "name":
             continue
-        ov = (old.get(k, "") or "").strip()
-        nv = (new.get(k, "") or "").strip()
-        if ov != nv:
-            diffs.append({"field": k, "old": ov, "new": nv})
+        nv = new.get(k, "")
+        if ov == nv:
+            continue
+        ovs = (ov or "").strip()
+        nvs = (nv or "").strip()
+        if ovs != nvs:
+            diffs.append({"field": k, "old": ovs, "new": nvs})
     return diffs
 
+def _json_dumps(obj: object) -> bytes:
+    """JSON → UTF-8 bytes(orjson 있으면 사용, 한글 그대로 기록)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _log_fd() -> int:
+    """변경 로그용 O_APPEND fd를 1회만 열어 재사용."""
+    global _LOG_FD
+    if _LOG_FD is None:
+        with _LOG_FD_LOCK:
+            if _LOG_FD is None:
+                _LOG_FD = os.open(str(LOG_PATH), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    return _LOG_FD
+
+_last_ts_sec: int = -1
+_last_ts: str = ""
+
+def _now_ts() -> str:
+    """현재 시각 "YYYY-MM-DD HH:MM:SS"(같은 초 안에서는 strftime 재사용)."""
+    global _last_ts_sec, _last_ts
+    sec = int(time.time())
+    if sec != _last_ts_sec:
+        _last_ts = datetime.fromtimestamp(sec).strftime("%Y-%m-%d %H:%M:%S")
+        _last_ts_sec = sec
+    return _last_ts
+
 def _append_change_log(employee: str, user: str, changes: List[Dict[str, str]]) -> None:
     """변경 로그 한 줄(JSONL) 추가."""
     if not changes:
         return
     entry = {
-        "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "ts": _now_ts(),
         "employee": employee,
         "user": user or "-",
         "changes": changes,
     }
     try:
-        with LOG_PATH.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # 한 줄을 단일 write로 기록(O_APPEND: 동시 기록 시에도 줄 단위로 덧붙음)
+        os.write(_log_fd(), _json_dumps(entry) + b"\n")
     except Exception:
         # 로그 실패는 서비스 중단 사유 아님
         pass
 
+def _tail_lines(path: Path, n: int, block: int = 4096) -> List[bytes]:
+    """파일 끝에서부터 블록 단위로 읽어 마지막 n줄(bytes) 반환(파일 전체를 읽지 않음)."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        data = b""
+        while size > 0 and data.count(b"\n") <= n:
+            read = min(block, size)
+            size -= read
+            f.seek(size)
+            data = f.read(read) + data
+    return data.splitlines()[-n:]
+
 def _read_recent_changes(max_items: int = 10) -> List[Dict[str, object]]:
     """최근 N개 변경 로그(신규순) 반환."""
     items: List[Dict[str, object]] = []
     if not LOG_PATH.exists():
         return items
     try:
-        with LOG_PATH.open("r", encoding="utf-8") as f:
-            lines = f.readlines()[-max_items:]
+        lines = _tail_lines(LOG_PATH, max_items)
         # 최신순 정렬 위해 역순
         for line in reversed(lines):
             try:
-                d = json.loads(line)
+                d = _json_loads(line)
                 items.append({
                     "employee": d.get("employee", ""),
                     "owner": d.get("user", "-"),
@@ -190,6 +739,14 @@ def _read_recent_changes(max_items: int = 10) -> List[Dict[str, object]]:
 # ============================
 # [UTILS] 날짜/연봉 정규화
 # ============================
+# 정규식은 모듈 로드 시 1회만 컴파일
+_RE_DOT_ZERO = re.compile(r"\d+\.0")                    # 엑셀 float 표기(예: 19900101.0)
+_RE_YMD8 = re.compile(r"\d{8}")                         # YYYYMMDD
+_RE_YMD6 = re.compile(r"\d{6}")                         # YYMMDD
+_RE_ISO = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")   # YYYY-M-D
+_RE_NUM = re.compile(r"(\d+(?:\.\d+)?)")                # 급여 숫자부
+_RE_TAIL = re.compile(r"\.0$")                          # 내선번호 float 꼬리
+
 def to_iso_date(val: str) -> str:
     # 다양한 포맷 → YYYY-MM-DD
     if val is None:
@@ -197,22 +754,22 @@ def to_iso_date(val: str) -> str:
     s = str(val).strip()
     if s == "" or s.lower() == "nan":
         return ""
-    if re.fullmatch(r"\d+\.0", s):
+    if _RE_DOT_ZERO.fullmatch(s):
         s = s[:-2]
     s = s.replace(".", "-").replace("/", "-")
-    if re.fullmatch(r"\d{8}", s):
+    if _RE_YMD8.fullmatch(s):
         try:
             return datetime(int(s[:4]), int(s[4:6]), int(s[6:8])).strftime("%Y-%m-%d")
         except ValueError:
             return ""
-    if re.fullmatch(r"\d{6}", s):
+    if _RE_YMD6.fullmatch(s):
         yy, mm, dd = int(s[:2]), int(s[2:4]), int(s[4:6])
         year = 2000 + yy if yy <= 69 else 1900 + yy
         try:
             return datetime(year, mm, dd).strftime("%Y-%m-%d")
         except ValueError:
             return ""
-    m = re.match(r"^(\d{4})-(\d{1,2})-(\d{1,2})", s)
+    m = _RE_ISO.match(s)
     if m:
         try:
             return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3))).strftime("%Y-%m-%d")
@@ -235,7 +792,7 @@ def normalize_salary(val: str) -> str:
     if s == "" or s.lower() == "nan":
         return ""
     raw = s.replace(",", "").replace(" ", "")
-    m = re.search(r"(\d+(?:\.\d+)?)", raw)
+    m = _RE_NUM.search(raw)
     if not m:
         return ""
     num = float(m.group(1))
@@ -247,22 +804,140 @@ def normalize_salary(val: str) -> str:
         return str(int(round(num)))
     return str(int(round(num * 10000)))
 
+DATE_COLS = ("birthdate", "hire_date", "exit_date")
+
+def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    캐시 구성 시 1회: 날짜/급여/내선번호 컬럼을 표시 형식으로 일괄 정규화(벡터화). 저장 값(SQLite/엑셀)은 그대로
+    - 날짜: to_iso_date가 다루는 YYYYMMDD / YYMMDD / YYYY-M-D(., / 구분 포함)는 pandas로 일괄 변환,
+      그 외(자유 형식)만 to_iso_date로 처리
+    - 급여: normalize_salary와 같은 규칙을 Series 연산으로 적용
+    """
+    for col in DATE_COLS:
+        raw = df[col].astype(str).str.strip()
+        # to_iso_date와 같은 전처리: 엑셀 float 꼬리(.0) 제거, 구분자 '.', '/' → '-'
+        s = (raw.str.replace(r"^(\d+)\.0$", r"\1", regex=True)
+                .str.replace(".", "-", regex=False).str.replace("/", "-", regex=False))
+        d8 = s.str.fullmatch(_RE_YMD8.pattern)
+        d6 = s.str.fullmatch(_RE_YMD6.pattern)
+        # YYMMDD: 69 이하는 20xx, 그 외 19xx
+        yy = pd.to_numeric(s.str[:2].where(d6), errors="coerce")
+        century = pd.Series("19", index=s.index).mask(yy <= 69, "20")
+        parsed = pd.to_datetime(s.where(d8).fillna((century + s).where(d6)), format="%Y%m%d", errors="coerce")
+        # YYYY-M-D(뒤에 시각 등이 붙어도 앞부분만 사용)
+        parts = s.where(~(d8 | d6)).str.extract(_RE_ISO.pattern).astype(float)
+        parts.columns = ["year", "month", "day"]
+        parsed = parsed.fillna(pd.to_datetime(parts, errors="coerce"))
+        out = parsed.dt.strftime("%Y-%m-%d").astype(object).where(parsed.notna(), "")
+        rest = parsed.isna() & (raw != "")
+        if rest.any():
+            out[rest] = raw[rest].map(to_iso_date)
+        df[col] = out
+
+    raw = df["salary"].astype(str).str.strip().str.replace(",", "", regex=False).str.replace(" ", "", regex=False)
+    num = pd.to_numeric(raw.str.extract(_RE_NUM.pattern, expand=False), errors="coerce")
+    # '만' 표기 또는 ('원' 없이) 5자리 미만 숫자 → 만원 단위로 간주
+    in_man = raw.str.contains("만", regex=False) | (~raw.str.contains("원", regex=False) & (num < 10000))
+    val = num.where(~in_man, num * 10000).round()
+    # Int64 캐스팅은 2**63 이상에서 실패하므로 int()로 직접 포맷(normalize_salary와 같은 결과)
+    out = pd.Series("", index=df.index, dtype=object)
+    finite = val.notna() & (val.abs() != float("inf"))
+    out[finite] = val[finite].map(lambda x: str(int(x)))
+    # 자릿수가 너무 커 float으로도 표현 불가(inf)한 값은 원문 그대로 표시
+    out[val.notna() & ~finite] = raw[val.notna() & ~finite]
+    df["salary"] = out
+
+    # 내선번호: 엑셀 float 꼬리(.0) 제거(목록/상세 모두 같은 값 표시)
+    df["extension_number"] = df["extension_number"].astype(str).str.replace(_RE_TAIL.pattern, "", regex=True)
+    return df
+
 # ============================
 # [SECURITY] IP Whitelist
 # ============================
-EXEMPT_IP_ENDPOINTS = {"static", "ip_block", "login"}  # 로그인은 예외
+# 예외 경로(로그인은 예외). 정적 파일은 접두사로 판별
+EXEMPT_IP_PATHS = frozenset({"/ip_block", "/login"})
+EXEMPT_IP_PREFIXES = (app.static_url_path + "/",)
 
-@app.before_request
-def check_ip_whitelist():
+def _parse_exact_ips(entries: Set[str]) -> FrozenSet[str]:
+    """단일 IP 항목 → 정규화된 주소 문자열 집합(IPv6 표기 차이도 일치). 잘못된 항목은 경고 후 무시."""
+    ips = set()
+    for entry in entries:
+        try:
+            ips.add(str(ipaddress.ip_address(entry)))
+        except ValueError:
+            app.logger.warning(f"Invalid IP_WHITELIST entry ignored: {entry}")
+    return frozenset(ips)
+
+def _parse_networks(entries: Set[str]) -> Dict[int, Tuple[List[int], List[int]]]:
     """
-    허용 IP가 설정되어 있으면, 예외 엔드포인트를 제외하고 접근 차단.
+    CIDR 항목(예: 10.0.0.0/8) → IP 버전별 (시작 주소 목록, 끝 주소 목록). 잘못된 항목은 경고 후 무시.
+    - 겹치는 대역은 collapse_addresses로 합쳐 서로 겹치지 않게 정렬 → 이분 탐색 가능
     """
-    if not request.endpoint or request.endpoint in EXEMPT_IP_ENDPOINTS:
-        return
-    client_ip = (request.remote_addr or "").strip()
-    if IP_WHITELIST and client_ip not in IP_WHITELIST:
-        app.logger.warning(f"Blocked IP {client_ip} accessing {request.path}")
-        return redirect(url_for("ip_block"), code=303)
+    nets: Dict[int, list] = {4: [], 6: []}
+    for entry in entries:
+        try:
+            net = ipaddress.ip_network(entry, strict=False)
+        except ValueError:
+            app.logger.warning(f"Invalid IP_WHITELIST entry ignored: {entry}")
+            continue
+        nets[net.version].append(net)
+    ranges: Dict[int, Tuple[List[int], List[int]]] = {}
+    for version, items in nets.items():
+        if items:
+            merged = list(ipaddress.collapse_addresses(items))  # 시작 주소 순 정렬 결과
+            ranges[version] = ([int(n.network_address) for n in merged],
+                               [int(n.broadcast_address) for n in merged])
+    return ranges
+
+# 정확 일치는 frozenset(상수 시간), CIDR은 겹침 없는 정렬 구간으로 import 시 1회 계산
+_EXACT_IPS: FrozenSet[str] = _parse_exact_ips({ip for ip in IP_WHITELIST if "/" not in ip})
+_NETS = _parse_networks({ip for ip in IP_WHITELIST if "/" in ip})
+_WHITELIST_ACTIVE: bool = bool(IP_WHITELIST)
+
+def _ip_allowed(ip: str) -> bool:
+    """화이트리스트 포함 여부(정확 일치 → CIDR 이분 탐색 O(log N) 순)."""
+    if ip in _EXACT_IPS:
+        return True
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    if _EXACT_IPS and str(addr) in _EXACT_IPS:  # 표기만 다른 주소(IPv6 대문자/0 생략 등)
+        return True
+    ranges = _NETS.get(addr.version)
+    if ranges is None:
+        return False
+    starts, ends = ranges
+    n = int(addr)
+    i = bisect_right(starts, n) - 1  # 시작 주소가 n 이하인 마지막 구간
+    return i >= 0 and n <= ends[i]
+
+class IPFilterMiddleware:
+    """
+    허용 IP가 설정되어 있으면, 예외 경로를 제외하고 접근 차단.
+    - Flask 라우팅/세션/요청 객체 생성 전(WSGI 단계)에서 판단 → 차단 요청은 303만 응답
+    - 화이트리스트가 비어 있으면 아예 설치하지 않음(요청당 비용 0)
+    """
+    def __init__(self, wsgi_app, block_path: str = "/ip_block"):
+        self.wsgi_app = wsgi_app
+        self.block_path = block_path
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path in EXEMPT_IP_PATHS or path.startswith(EXEMPT_IP_PREFIXES):
+            return self.wsgi_app(environ, start_response)
+        client_ip = (environ.get("REMOTE_ADDR") or "").strip()
+        if _ip_allowed(client_ip):
+            return self.wsgi_app(environ, start_response)
+        app.logger.warning(f"Blocked IP {client_ip} accessing {path}")
+        start_response("303 See Other", [
+            ("Location", environ.get("SCRIPT_NAME", "") + self.block_path),
+            ("Content-Length", "0"),
+        ])
+        return [b""]
+
+if _WHITELIST_ACTIVE:
+    app.wsgi_app = IPFilterMiddleware(app.wsgi_app)
 
 @app.route("/ip_block")
 def ip_block():
@@ -284,7 +959,61 @@ ADMIN_USERS_INLINE: Dict[str, str] = {
     "admin": "1234",
     "assesta": "0820",
 }
-USERS: Dict[str, str] = {u: generate_password_hash(pw) for u, pw in ADMIN_USERS_INLINE.items()}
+PW_HASH_METHOD = "pbkdf2:sha256:50000"  # 해시 비용 명시(검증 1회당 CPU 비용 고정)
+_USER_HASHES: Dict[str, str] = {}       # 사용자명 → 해시(기동 시가 아닌 최초 로그인 시 계산)
+
+def _password_hash(username: str) -> Optional[str]:
+    """사용자 비밀번호 해시(없는 사용자는 None). 사용자별 1회만 계산."""
+    pw = ADMIN_USERS_INLINE.get(username)
+    if pw is None:
+        return None
+    pw_hash = _USER_HASHES.get(username)
+    if pw_hash is None:
+        pw_hash = _USER_HASHES.setdefault(username, generate_password_hash(pw, method=PW_HASH_METHOD))
+    return pw_hash
+
+@lru_cache(maxsize=16)
+def _verify_password(username: str, password: str) -> bool:
+    """비밀번호 검증(결과 캐시: 같은 조합 반복 시 PBKDF2 생략). 로그아웃 시 캐시 비움."""
+    pw_hash = _password_hash(username)
+    return bool(pw_hash) and check_password_hash(pw_hash, password)
+
+# 로그인 시도 제한(IP별, 슬라이딩 윈도): 비밀번호 해시 검증 CPU 소모 방지
+LOGIN_RATE_LIMIT: int = int(os.getenv("LOGIN_RATE_LIMIT", "10"))   # 윈도당 허용 횟수
+LOGIN_RATE_WINDOW: float = 60.0                                    # 초
+LOGIN_RATE_MAX_IPS: int = 10000                                    # 추적 IP 수 상한(메모리 보호)
+_LOGIN_ATTEMPTS: Dict[str, Deque[float]] = {}
+_LOGIN_ATTEMPTS_LOCK = Lock()
+_LOGIN_SWEEP_AT: float = 0.0  # 다음 전체 정리 시각(monotonic)
+
+def _ratelimit_hit(ip: str) -> bool:
+    """
+    최근 LOGIN_RATE_WINDOW초 내 시도가 한도를 넘으면 True(이번 시도는 기록하지 않음).
+    - 윈도가 지나 비는 IP는 삭제, 윈도마다 1회 전체 정리(다시 오지 않는 IP 제거)
+    - IP가 계속 바뀌어도(IPv6 등) 상한 초과 시 가장 먼저 기록된 IP부터 제거
+    """
+    global _LOGIN_SWEEP_AT
+    now = time.monotonic()
+    with _LOGIN_ATTEMPTS_LOCK:
+        if now >= _LOGIN_SWEEP_AT:
+            for stale in [k for k, v in _LOGIN_ATTEMPTS.items() if now - v[-1] > LOGIN_RATE_WINDOW]:
+                del _LOGIN_ATTEMPTS[stale]
+            _LOGIN_SWEEP_AT = now + LOGIN_RATE_WINDOW
+        q = _LOGIN_ATTEMPTS.get(ip)
+        if q is not None:
+            while q and now - q[0] > LOGIN_RATE_WINDOW:
+                q.popleft()
+            if len(q) >= LOGIN_RATE_LIMIT:
+                return True
+            if not q:
+                del _LOGIN_ATTEMPTS[ip]
+                q = None
+        if q is None:
+            while len(_LOGIN_ATTEMPTS) >= LOGIN_RATE_MAX_IPS:
+                del _LOGIN_ATTEMPTS[next(iter(_LOGIN_ATTEMPTS))]
+            q = _LOGIN_ATTEMPTS[ip] = deque()
+        q.append(now)
+        return False
 
 class User(UserMixin):
     def __init__(self, id_: str):
@@ -296,7 +1025,7 @@ class User(UserMixin):
 
 @login_manager.user_loader
 def load_user(user_id: str):
-    return User(user_id) if user_id in USERS else None
+    return User(user_id) if user_id in ADMIN_USERS_INLINE else None
 
 # ============================
 # [ROUTES] 로그인
@@ -306,12 +1035,14 @@ def login():
     if current_user.is_authenticated:
         return redirect(url_for("main"))
     if request.method == "POST":
+        if _ratelimit_hit(request.remote_addr or ""):
+            flash("로그인 시도가 너무 많습니다. 잠시 후 다시 시도해 주세요.", "danger")
+            return render_template("login.html"), 429
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
-        pw_hash = USERS.get(username)
-        if not pw_hash:
+        if username not in ADMIN_USERS_INLINE:
             flash("존재하지 않는 사용자명입니다.", "danger")
-        elif not check_password_hash(pw_hash, password):
+        elif not _verify_password(username, password):
             flash("비밀번호가 올바르지 않습니다.", "danger")
         else:
             login_user(User(username))
@@ -324,6 +1055,7 @@ def login():
 @login_required
 def logout():
     logout_user()
+    _verify_password.cache_clear()
     flash("로그아웃되었습니다.", "success")
     return redirect(url_for("login"))
 
@@ -341,7 +1073,7 @@ def _dashboard_context():
     ctx = {}
     # 직원 수
     try:
-        df = load_df()
+        df = load_df(copy=False)
         ctx["employee_count"] = int(df.shape[0])
     except Exception:
         ctx["employee_count"] = "-"
@@ -373,6 +1105,11 @@ def _dashboard_context():
 def main():
     return render_template("main.html", **_dashboard_context())
 
+# 직원 목록 HTML 캐시: 캐시 DataFrame이 같으면(수정/가져오기 시 교체됨) (사용자, 검색어)별 렌더 결과 재사용
+# - 사용자 포함: base.html이 current_user.id를 표시. 항목 수 상한 초과 시 비움(검색어 무제한 누적 방지)
+_LIST_RENDER_CACHE: Dict[str, object] = {"df": None, "pages": {}}
+_LIST_RENDER_MAX = 64
+
 @app.route("/employees", methods=["GET"])
 @login_required
 def employee_list():
@@ -380,40 +1117,50 @@ def employee_list():
     직원 목록 화면
     - team_order 우선 정렬
     - q 파라미터로 서버사이드 간단 검색
+    - 렌더 결과 캐시(템플릿 자동 재로딩 중에는 사용 안 함)
     """
+    global _LIST_RENDER_CACHE
     team_order = ["경영진", "플랫폼솔루션개발팀", "경영지원팀", "센터"]
-    df = load_df()
-
-    if "extension_number" not in df.columns:
-        df["extension_number"] = ""
+    df = load_df(copy=False)  # 읽기 전용(extension_number 등은 load_df에서 보강됨)
+    q = (request.args.get("q", "") or "").strip().lower()
 
-    subset = df[["name", "team_name", "position", "extension_number", "mbti"]].copy()
+    use_cache = not app.config["TEMPLATES_AUTO_RELOAD"]
+    page_key = (current_user.id, q)
+    cache = _LIST_RENDER_CACHE
+    if use_cache and cache["df"] is df:
+        html = cache["pages"].get(page_key)
+        if html is not None:
+            return html
 
-    q = (request.args.get("q", "") or "").strip().lower()
+    subset = df.loc[:, SEARCH_COLUMNS]
     if q:
-        mask = subset.apply(lambda row: any(q in str(v).lower() for v in row.values), axis=1)
-        subset = subset[mask]
-
-    records = subset.to_dict(orient="records")
+        # 미리 소문자 결합해 둔 검색 문자열에 1회 부분일치(정규식 미사용)
+        subset = subset[search_text(df).str.contains(q, regex=False).to_numpy()]
 
-    priority = {team: idx for idx, team in enumerate(team_order)}
-    default_priority = len(team_order)
-    records_sorted = sorted(records, key=lambda emp: priority.get(emp.get("team_name", ""), default_priority))
+    # team_order 우선, 나머지 팀은 첫 등장 순(팀 → 순위 map 1회 + 안정 정렬)
+    team_order_set = set(team_order)
+    rest_teams = [t for t in subset["team_name"].unique() if t not in team_order_set]
+    priority = {t: i for i, t in enumerate(team_order + rest_teams)}
+    order = subset["team_name"].map(priority).to_numpy()
+    subset = subset.iloc[order.argsort(kind="stable")]
 
-    teams_seen = []
-    for emp in records_sorted:
-        t = emp.get("team_name", "")
-        if t and t not in teams_seen:
-            teams_seen.append(t)
-    other_teams = [t for t in teams_seen if t not in team_order]
+    # 정렬 결과는 팀별로 연속 → 한 번 순회로 (팀, 직원 목록) 묶음(팀명 빈 행은 표시 안 함)
+    # 행은 dict 대신 namedtuple(emp.name 등 속성 접근)
+    rows = subset.itertuples(index=False, name="Employee")
+    team_groups = [(team, list(group)) for team, group in groupby(rows, key=attrgetter("team_name")) if team]
 
-    return render_template(
+    html = render_template(
         "employee_list.html",
-        employees=records_sorted,
-        team_order=team_order,
-        other_teams=other_teams,
+        team_groups=team_groups,
         query=q,
     )
+    if use_cache:
+        if cache["df"] is not df:
+            cache = _LIST_RENDER_CACHE = {"df": df, "pages": {}}
+        elif len(cache["pages"]) >= _LIST_RENDER_MAX:
+            cache["pages"].clear()
+        cache["pages"][page_key] = html
+    return html
 
 # ============================
 # [ROUTES] 직원 상세
@@ -421,29 +1168,29 @@ def employee_list():
 @app.route("/employees/<string:name>", methods=["GET", "POST"])
 @login_required
 def employee_detail(name: str):
-    df = load_df()
-    if "name" not in df.columns or name not in df["name"].values:
+    # GET/POST 모두 캐시 원본을 읽기만 함(수정은 update_employee가 복사본에 반영)
+    df, name_index, col_index = load_df_indexed(copy=False)
+    idx = name_index.get(name)
+    if idx is None:
         abort(404, description="해당 직원을 찾을 수 없습니다.")
 
-    DATE_FIELDS_IN_FORM = {"birthdate", "hire_date", "exit_date"}
-
     if request.method == "POST":
-        mask = df["name"] == name
-
         # 1) 기존 행 스냅샷
-        row_old: Dict[str, str] = df.loc[mask].iloc[0].to_dict()
+        row_old: Dict[str, str] = df.iloc[idx].to_dict()
 
         # 2) 전체 행 복사 후 폼값만 덮어쓰기(서버 정규화 포함)
         row_new: Dict[str, str] = dict(row_old)
-        for form_key in request.form:
+        for form_key, value in request.form.items():
             if form_key == "name":  # 식별자 변경 금지
                 continue
-            value = request.form.get(form_key, "").strip()
-            if form_key in DATE_FIELDS_IN_FORM:
+            value = value.strip()
+            if form_key in DATE_COLS:
                 value = to_iso_date(value)
-            if form_key == "salary":
+            elif form_key == "salary":
                 value = normalize_salary(value)
-            if form_key in df.columns:
+            elif form_key == "extension_number":
+                value = _RE_TAIL.sub("", value)
+            if form_key in col_index:
                 row_new[form_key] = value
             else:
                 # 필요 시 신규 컬럼 허용 정책이면 다음 줄 주석 해제
@@ -453,12 +1200,10 @@ def employee_detail(name: str):
         # 3) 변경점 계산
         diffs = _diff_row(row_old, row_new)
 
-        # 4) 변경된 필드만 실제 저장 + 로그 기록
-        for ch in diffs:
-            df.loc[mask, ch["field"]] = ch["new"]
-
+        # 4) 변경된 필드만 저장(행 단위 UPDATE) + 로그 기록
         if diffs:
-            save_df(df)
+            if not update_employee(name, {ch["field"]: ch["new"] for ch in diffs}):
+                abort(404, description="해당 직원을 찾을 수 없습니다.")
             _append_change_log(
                 employee=name,
                 user=(current_user.id if current_user.is_authenticated else "-"),
@@ -471,32 +1216,32 @@ def employee_detail(name: str):
         return redirect(url_for("employee_detail", name=name), code=303)
 
 
-    # GET: 표시 데이터 가공
-    row = df.loc[df["name"] == name].iloc[0].to_dict()
-    for k, v in list(row.items()):
-        v = "" if pd.isna(v) else str(v)
-        if k == "extension_number":
-            v = re.sub(r"\.0$", "", v)  # 엑셀 float 꼬리 제거
-        row[k] = v
-    row["birthdate"] = to_iso_date(row.get("birthdate", ""))
-    row["hire_date"]  = to_iso_date(row.get("hire_date", ""))
-    row["exit_date"]  = to_iso_date(row.get("exit_date", ""))
-    row["salary"]     = normalize_salary(row.get("salary", ""))
-
-    return render_template("employee_detail.html", employee=row)
+    # GET: 캐시 값은 이미 문자열(결측 없음) + 날짜/급여/내선번호 정규화됨(normalize_df)
+    return render_template("employee_detail.html", employee=df.iloc[idx].to_dict())
 
 # ============================
 # [ROUTES] Media: Resume / Photo
 # ============================
+# 기준 디렉터리는 import 시 1회만 resolve(요청마다 realpath 호출 생략)
+_RESUME_ROOT: str = str(RESUME_DIR.resolve()) + os.sep
+_PHOTO_ROOT: str = str(PHOTO_DIR.resolve()) + os.sep
+
+def _media_path(root: str, name: str, suffix: str) -> Path:
+    """
+    root 바로 아래 <name><suffix> 경로(디렉터리 탈출 방지).
+    - 경로 구분자/NUL이 없으면 하위 경로가 될 수 없으므로 resolve 없이 문자열로 검사
+    - secure_filename은 한글 이름을 지우므로 사용하지 않음
+    """
+    if not name or "/" in name or "\\" in name or "\x00" in name:
+        raise NotFound()
+    return Path(root + name + suffix)
+
 def _resume_path(name: str) -> Path:
     """
     이름 기반 PDF 경로(디렉터리 탈출 방지).
     - private/resume/<name>.pdf
     """
-    p = (RESUME_DIR / f"{name}.pdf").resolve()
-    if not str(p).startswith(str(RESUME_DIR.resolve())) or p.suffix.lower() != ".pdf":
-        raise NotFound()
-    return p
+    return _media_path(_RESUME_ROOT, name, ".pdf")
 
 @app.route("/employees/<name>/resume/view", endpoint="resume_view")
 @login_required
@@ -509,11 +1254,11 @@ def resume_view(name: str):
         fp = _resume_path(name)
         if not fp.exists():
             raise NotFound()
-        return send_file(
-            str(fp),
+        return send_from_directory(
+            RESUME_DIR,
+            fp.name,
             mimetype="application/pdf",
             as_attachment=False,
-            download_name=fp.name,
             conditional=True,
         )
     except NotFound:
@@ -538,10 +1283,7 @@ def _photo_path(name: str) -> Path:
     이름 기반 PNG 경로(디렉터리 탈출 방지).
     - private/photo/<name>.png
     """
-    p = (PHOTO_DIR / f"{name}.png").resolve()
-    if not str(p).startswith(str(PHOTO_DIR.resolve())) or p.suffix.lower() != ".png":
-        raise NotFound()
-    return p
+    return _media_path(_PHOTO_ROOT, name, ".png")
 
 @app.route("/employees/<name>/photo", endpoint="photo_view")
 @login_required
@@ -553,19 +1295,36 @@ def photo_view(name: str):
     try:
         fp = _photo_path(name)
         if not fp.exists():
-            fp = (PHOTO_DIR / "default.png").resolve()
+            fp = Path(_PHOTO_ROOT + "default.png")
             if not fp.exists():
                 raise NotFound()
-        return send_file(
-            str(fp),
+        return send_from_directory(
+            PHOTO_DIR,
+            fp.name,
             mimetype="image/png",
             as_attachment=False,
-            download_name=fp.name,
             conditional=True,
         )
     except NotFound:
         abort(404)
 
+# ============================
+# [ROUTES] 관리: 엑셀 내보내기
+# ============================
+@app.route("/admin/export_xlsx", methods=["GET"])
+@login_required
+def export_xlsx():
+    """
+    미반영 수정사항을 엑셀(insa_DB.xlsx)에 기록한 뒤 다운로드로 반환.
+    """
+    flush_xlsx()
+    return send_from_directory(
+        DB_DIR,
+        DB_FILENAME,
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        as_attachment=True,
+    )
+
 # ============================
 # [ENTRYPOINT]
 # ============================